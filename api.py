@@ -1,18 +1,27 @@
 """
 FastAPI web application for Map Poster Generator.
 """
+import anyio
 import asyncio
+import functools
+import hashlib
+import json
 import logging
 import os
-import uuid
+import secrets
+import shutil
+import threading
+import time
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, status
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from models import (
@@ -29,8 +38,10 @@ from models import (
     HealthResponse,
 )
 from create_map_poster import (
-    get_coordinates,
-    get_available_themes,
+    THEMES_DIR,
+    get_coordinates_async,
+    open_geocoder_client,
+    close_geocoder_client,
     load_theme,
     create_poster,
     generate_output_filename,
@@ -40,7 +51,7 @@ from create_map_poster import (
 from database import (
     create_job_db,
     get_job_db,
-    update_job_status_db,
+    update_job_and_return,
     get_all_jobs_db,
 )
 
@@ -58,6 +69,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration
@@ -69,133 +81,346 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def create_job(request_data: dict) -> str:
+# Theme lookups are read-dominated and the themes directory rarely changes,
+# so cache one pass over the directory — names and parsed JSON together —
+# with a short TTL instead of hitting the filesystem on every request.
+_THEMES_TTL = 60.0
+_themes_cache = {"value": None, "fetched_at": 0.0}
+_themes_lock = threading.Lock()
+
+
+def _scan_themes() -> dict:
+    """Scan the themes directory once, parsing every theme JSON."""
+    themes = {}
+    if not os.path.isdir(THEMES_DIR):
+        return themes
+    with os.scandir(THEMES_DIR) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_file() and entry.name.endswith(".json"):
+                with open(entry.path, "r") as f:
+                    themes[entry.name[:-5]] = json.load(f)
+    return themes
+
+
+def _all_themes_cached() -> dict:
+    """Return {theme_name: theme_dict} for all themes, cached with a TTL."""
+    if (
+        _themes_cache["value"] is not None
+        and time.monotonic() - _themes_cache["fetched_at"] < _THEMES_TTL
+    ):
+        return _themes_cache["value"]
+    with _themes_lock:
+        # Re-check under the lock so a thundering herd on a cold cache
+        # results in a single directory scan.
+        if (
+            _themes_cache["value"] is not None
+            and time.monotonic() - _themes_cache["fetched_at"] < _THEMES_TTL
+        ):
+            return _themes_cache["value"]
+        themes = _scan_themes()
+        _themes_cache["value"] = themes
+        _themes_cache["fetched_at"] = time.monotonic()
+        return themes
+
+
+def _cached_themes() -> list:
+    """Return the available theme names, cached with a TTL."""
+    return list(_all_themes_cached())
+
+
+def _cached_load_theme(theme_name: str) -> dict:
+    """Return a theme dict from the cache, falling back to load_theme."""
+    theme = _all_themes_cached().get(theme_name)
+    if theme is not None:
+        return theme
+    return load_theme(theme_name)
+
+
+# Dedicated pool for matplotlib renders, bounded to keep memory in check
+# while still overlapping CPU work across cores. Renders can take minutes,
+# so they get their own pool rather than the default asyncio executor to
+# avoid starving cheap metadata reads that use asyncio.to_thread.
+_RENDER_POOL = ThreadPoolExecutor(
+    max_workers=min(os.cpu_count() or 1, 4),
+    thread_name_prefix="poster",
+)
+
+
+class SendfileResponse(FileResponse):
+    """FileResponse tuned for multi-MB poster/ZIP downloads.
+
+    Starlette already hands the file path to the server via the ASGI
+    ``http.response.pathsend`` extension when the server supports it,
+    which lets the server use kernel sendfile (zero-copy). When the
+    server lacks that extension (e.g. uvicorn/h11), fall back to 1 MiB
+    read chunks instead of the default 64 KiB to cut per-chunk syscall
+    and ASGI-message overhead.
+    """
+    chunk_size = 1 << 20
+
+    async def _handle_simple(self, send, send_header_only: bool, send_pathsend: bool) -> None:
+        if send_header_only or send_pathsend:
+            await super()._handle_simple(send, send_header_only, send_pathsend)
+            return
+        # Open before the response starts: when a stored stat_result was
+        # passed no existence check has run, and an artifact pruned since
+        # completion must surface as the clean 404 below instead of
+        # failing after the headers are already on the wire.
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await send({
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            })
+            more_body = True
+            while more_body:
+                chunk = await file.read(self.chunk_size)
+                more_body = len(chunk) == self.chunk_size
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": more_body,
+                })
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Poster file not found",
+            )
+
+
+# Media types for poster downloads, hoisted so the heavily polled download
+# endpoint does not rebuild the dict per request.
+_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+    ".pdf": "application/pdf",
+    ".zip": "application/zip",
+}
+
+
+# Identical poster requests produce identical artifacts, so dedupe them:
+# completed renders are remembered by request hash and re-served from disk,
+# and concurrent identical requests share one in-flight job.
+_artifact_cache: Dict[str, str] = {}
+_inflight: Dict[str, str] = {}
+
+
+def _poster_cache_key(request_data: dict) -> str:
+    """Hash the normalized request payload into a short artifact key."""
+    payload = json.dumps(request_data, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+# Status polling hammers the job-lookup path, so keep a bounded in-process
+# LRU of job rows in front of the database. Terminal rows (completed/failed)
+# never change and are served from the cache indefinitely; in-progress rows
+# get a short TTL so polls within the window skip the DB roundtrip.
+_JOB_CACHE_MAX = 10_000
+_JOB_CACHE_TTL = 2.0
+_TERMINAL_STATUSES = {"completed", "failed"}
+_job_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _job_cache_put(job) -> None:
+    """Insert or refresh a job row in the LRU cache."""
+    if job is None:
+        return
+    _job_cache[job.job_id] = (job, time.monotonic())
+    _job_cache.move_to_end(job.job_id)
+    while len(_job_cache) > _JOB_CACHE_MAX:
+        _job_cache.popitem(last=False)
+
+
+def _get_job_cached(job_id: str):
+    """Get a job row, preferring the in-process cache over the DB."""
+    entry = _job_cache.get(job_id)
+    if entry is not None:
+        job, cached_at = entry
+        if job.status in _TERMINAL_STATUSES or time.monotonic() - cached_at < _JOB_CACHE_TTL:
+            _job_cache.move_to_end(job_id)
+            return job
+    job = get_job_db(job_id)
+    _job_cache_put(job)
+    return job
+
+
+# Event fan-out for SSE job watchers: update_job_status signals the event
+# for a job after each write, so any number of watchers learn about a
+# transition from the one DB write that caused it — no polling.
+_job_events: Dict[str, asyncio.Event] = {}
+_job_watchers: Dict[str, int] = {}
+_main_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _notify_job_event(job_id: str) -> None:
+    """Wake SSE watchers of a job; safe to call from worker threads."""
+    evt = _job_events.get(job_id)
+    if evt is not None and _main_loop is not None:
+        _main_loop.call_soon_threadsafe(evt.set)
+
+
+@app.on_event("startup")
+async def startup_geocoder():
+    """Open the shared async geocoder HTTP client."""
+    global _main_loop
+    _main_loop = asyncio.get_running_loop()
+    open_geocoder_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_geocoder():
+    """Close the shared async geocoder HTTP client."""
+    await close_geocoder_client()
+
+
+def create_job(request_data: dict, status: str = "pending") -> str:
     """Create a new job and return job ID."""
-    job_id = str(uuid.uuid4())
-    create_job_db(job_id, request_data)
-    logger.info(f"Created job {job_id}")
+    # 96 bits of entropy in 24 hex chars: collision-safe for job IDs while
+    # keeping dict hashes, DB index keys, and URLs shorter than a UUID
+    job_id = secrets.token_hex(12)
+    job = create_job_db(job_id, request_data, status=status)
+    _job_cache_put(job)
+    logger.info("Created job %s", job_id)
     return job_id
 
 
 def update_job_status(job_id: str, status: str, **kwargs):
     """Update job status and other fields."""
-    update_job_status_db(job_id, status, **kwargs)
-    logger.info(f"Updated job {job_id}: status={status}")
+    job = update_job_and_return(job_id, status, **kwargs)
+    _job_cache_put(job)
+    _notify_job_event(job_id)
+    logger.info("Updated job %s: status=%s", job_id, status)
 
 
-async def generate_poster_task(job_id: str, request: PosterRequest):
+async def generate_poster_task(job_id: str, request: PosterRequest, cache_key: str):
     """Background task to generate poster."""
     try:
-        logger.info(f"Starting poster generation for job {job_id}")
-        update_job_status(job_id, "processing")
+        logger.info("Starting poster generation for job %s", job_id)
         
         # Get coordinates (either provided or geocoded)
         if request.lat is not None and request.lon is not None:
             coords = (request.lat, request.lon)
-            logger.info(f"Using provided coordinates: {coords}")
+            logger.info("Using provided coordinates: %s", coords)
         else:
-            logger.info(f"Geocoding {request.city}, {request.country}")
-            coords = await asyncio.to_thread(
-                get_coordinates, request.city, request.country
-            )
+            logger.info("Geocoding %s, %s", request.city, request.country)
+            coords = await get_coordinates_async(request.city, request.country)
         
         # Load theme
-        logger.info(f"Loading theme: {request.theme}")
-        theme = await asyncio.to_thread(load_theme, request.theme)
+        logger.info("Loading theme: %s", request.theme)
+        theme = _cached_load_theme(request.theme)
         
         # Generate output filename
         output_file = generate_output_filename(
             request.city, request.theme, request.format
         )
         
-        # Create poster (blocking operation, run in thread)
-        logger.info(f"Generating poster for {request.city}")
-        await asyncio.to_thread(
-            create_poster,
-            request.city,
-            request.country,
-            coords,
-            request.distance,
-            output_file,
-            request.format,
-            theme,
-            country_label=request.country_label,
+        # Create poster (blocking operation, run on the render pool)
+        logger.info("Generating poster for %s", request.city)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            _RENDER_POOL,
+            functools.partial(
+                create_poster,
+                request.city,
+                request.country,
+                coords,
+                request.distance,
+                output_file,
+                request.format,
+                theme,
+                country_label=request.country_label,
+            ),
         )
         
-        # Update job as completed
-        update_job_status(
+        # Update job as completed, stashing file metadata so the download
+        # path can skip its own stat
+        st = os.stat(output_file)
+        await asyncio.to_thread(
+            update_job_status,
             job_id,
             "completed",
             completed_at=datetime.now(),
             poster_path=output_file,
+            poster_size=st.st_size,
+            poster_mtime=st.st_mtime,
         )
-        logger.info(f"Poster generation completed for job {job_id}")
+        _artifact_cache[cache_key] = output_file
+        logger.info("Poster generation completed for job %s", job_id)
         
     except Exception as e:
-        logger.error(f"Error generating poster for job {job_id}: {str(e)}", exc_info=True)
-        update_job_status(
+        logger.error("Error generating poster for job %s: %s", job_id, e, exc_info=True)
+        await asyncio.to_thread(
+            update_job_status,
             job_id,
             "failed",
             completed_at=datetime.now(),
             error=str(e),
         )
+    finally:
+        _inflight.pop(cache_key, None)
+
 
+def _render_one(theme_name: str, theme: dict, request: AllThemesPosterRequest, coords) -> str:
+    """Render a single themed poster and return its output path."""
+    logger.info("Generating poster with theme: %s", theme_name)
+    output_file = generate_output_filename(
+        request.city, theme_name, request.format
+    )
+    create_poster(
+        request.city,
+        request.country,
+        coords,
+        request.distance,
+        output_file,
+        request.format,
+        theme,
+        country_label=request.country_label,
+    )
+    return output_file
 
-async def generate_all_themes_task(job_id: str, request: AllThemesPosterRequest):
+
+async def generate_all_themes_task(job_id: str, request: AllThemesPosterRequest, cache_key: str):
     """Background task to generate posters for all themes and create a ZIP file."""
     try:
-        logger.info(f"Starting all-themes poster generation for job {job_id}")
-        update_job_status(job_id, "processing")
+        logger.info("Starting all-themes poster generation for job %s", job_id)
         
         # Get coordinates (either provided or geocoded)
         if request.lat is not None and request.lon is not None:
             coords = (request.lat, request.lon)
-            logger.info(f"Using provided coordinates: {coords}")
+            logger.info("Using provided coordinates: %s", coords)
         else:
-            logger.info(f"Geocoding {request.city}, {request.country}")
-            coords = await asyncio.to_thread(
-                get_coordinates, request.city, request.country
-            )
+            logger.info("Geocoding %s, %s", request.city, request.country)
+            coords = await get_coordinates_async(request.city, request.country)
         
-        # Get all available themes
-        available_themes = await asyncio.to_thread(get_available_themes)
-        logger.info(f"Generating posters for {len(available_themes)} themes")
-        
-        # Generate posters for all themes
+        # Get all themes in one cached pass: names and parsed dicts
+        themes_dict = _all_themes_cached()
+        available_themes = list(themes_dict)
+        logger.info("Generating posters for %d themes", len(available_themes))
+
+        # Fan the renders out over the bounded pool so themes render
+        # concurrently instead of serially.
+        loop = asyncio.get_running_loop()
+        render_tasks = [
+            loop.run_in_executor(
+                _RENDER_POOL, _render_one, theme_name, themes_dict[theme_name], request, coords
+            )
+            for theme_name in available_themes
+        ]
+        results = await asyncio.gather(*render_tasks, return_exceptions=True)
+
+        # Continue with other themes even if one fails
         poster_files = []
-        for theme_name in available_themes:
-            try:
-                logger.info(f"Generating poster with theme: {theme_name}")
-                
-                # Load theme
-                theme = await asyncio.to_thread(load_theme, theme_name)
-                
-                # Generate output filename
-                output_file = generate_output_filename(
-                    request.city, theme_name, request.format
-                )
-                
-                # Create poster
-                await asyncio.to_thread(
-                    create_poster,
-                    request.city,
-                    request.country,
-                    coords,
-                    request.distance,
-                    output_file,
-                    request.format,
-                    theme,
-                    country_label=request.country_label,
-                )
-                
-                poster_files.append(output_file)
-                logger.info(f"Completed poster with theme: {theme_name}")
-                
-            except Exception as e:
-                logger.error(f"Error generating poster for theme {theme_name}: {str(e)}")
-                # Continue with other themes even if one fails
+        for theme_name, result in zip(available_themes, results):
+            if isinstance(result, BaseException):
+                logger.error("Error generating poster for theme %s: %s", theme_name, result)
                 continue
-        
+            poster_files.append(result)
+            logger.info("Completed poster with theme: %s", theme_name)
+
         if not poster_files:
             raise RuntimeError("Failed to generate any posters")
         
@@ -205,35 +430,67 @@ async def generate_all_themes_task(job_id: str, request: AllThemesPosterRequest)
         zip_filename = f"{city_slug}_all_themes_{timestamp}.zip"
         zip_path = os.path.join(POSTERS_DIR, zip_filename)
         
-        logger.info(f"Creating ZIP file: {zip_path}")
+        logger.info("Creating ZIP file: %s", zip_path)
         await asyncio.to_thread(create_zip_file, zip_path, poster_files)
         
-        # Update job as completed
-        update_job_status(
+        # Update job as completed, stashing file metadata so the download
+        # path can skip its own stat
+        st = os.stat(zip_path)
+        await asyncio.to_thread(
+            update_job_status,
             job_id,
             "completed",
             completed_at=datetime.now(),
             poster_path=zip_path,
+            poster_size=st.st_size,
+            poster_mtime=st.st_mtime,
         )
-        logger.info(f"All-themes poster generation completed for job {job_id}")
+        _artifact_cache[cache_key] = zip_path
+        logger.info("All-themes poster generation completed for job %s", job_id)
         
     except Exception as e:
-        logger.error(f"Error generating all-themes posters for job {job_id}: {str(e)}", exc_info=True)
-        update_job_status(
+        logger.error("Error generating all-themes posters for job %s: %s", job_id, e, exc_info=True)
+        await asyncio.to_thread(
+            update_job_status,
             job_id,
             "failed",
             completed_at=datetime.now(),
             error=str(e),
         )
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+# PNG/PDF/JPEG payloads are already entropy-compressed, so DEFLATE only
+# burns CPU for <1% savings; store them as-is and only deflate text
+# formats like SVG.
+_ZIP_DEFLATE_EXTENSIONS = {".svg"}
 
 
 def create_zip_file(zip_path: str, files: list):
     """Create a ZIP file containing the specified files."""
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in files:
-            if os.path.exists(file_path):
-                # Add file to ZIP with just the filename (no path)
-                zipf.write(file_path, os.path.basename(file_path))
+    with open(zip_path, 'wb', buffering=1 << 20) as zip_fp:
+        with zipfile.ZipFile(zip_fp, 'w', zipfile.ZIP_STORED, allowZip64=True) as zipf:
+            for file_path in files:
+                # Add file to ZIP with just the filename (no path). ZipInfo
+                # carries the stat, so a missing file surfaces here as
+                # FileNotFoundError instead of needing a separate exists()
+                # check, and the 1 MiB copy buffer keeps syscalls low.
+                try:
+                    info = zipfile.ZipInfo.from_file(
+                        file_path, os.path.basename(file_path)
+                    )
+                except FileNotFoundError:
+                    continue
+                ext = Path(file_path).suffix.lower()
+                info.compress_type = (
+                    zipfile.ZIP_DEFLATED
+                    if ext in _ZIP_DEFLATE_EXTENSIONS
+                    else zipfile.ZIP_STORED
+                )
+                with open(file_path, 'rb', buffering=1 << 20) as src:
+                    with zipf.open(info, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, length=1 << 20)
 
 
 @app.get("/", tags=["General"])
@@ -248,10 +505,10 @@ async def root():
 
 
 @app.get("/api/health", response_model=HealthResponse, tags=["General"])
-async def health_check():
+def health_check():
     """Health check endpoint."""
-    themes = await asyncio.to_thread(get_available_themes)
-    return HealthResponse(
+    themes = _cached_themes()
+    return HealthResponse.model_construct(
         status="healthy",
         version="1.0.0",
         themes_available=len(themes),
@@ -265,7 +522,7 @@ async def health_check():
     status_code=status.HTTP_202_ACCEPTED,
     tags=["Posters"],
 )
-async def create_poster_endpoint(
+def create_poster_endpoint(
     request: PosterRequest,
     background_tasks: BackgroundTasks,
 ):
@@ -274,30 +531,57 @@ async def create_poster_endpoint(
     
     Returns a job ID that can be used to check status and download the poster.
     """
-    # Validate coordinates if provided
-    if (request.lat is None) != (request.lon is None):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Both latitude and longitude must be provided together",
-        )
-    
     # Validate theme exists
-    available_themes = await asyncio.to_thread(get_available_themes)
+    available_themes = _cached_themes()
     if request.theme not in available_themes:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Theme '{request.theme}' not found. Available: {', '.join(available_themes)}",
         )
     
-    # Create job
-    job_id = create_job(request.model_dump())
+    # Dump the model once (skipping None-valued fields) and reuse it for
+    # both the artifact key and the stored job row.
+    request_data = request.model_dump(mode="json", exclude_none=True)
+    cache_key = _poster_cache_key(request_data)
+
+    # Re-serve a previously rendered artifact for an identical request
+    cached_path = _artifact_cache.get(cache_key)
+    if cached_path and os.path.exists(cached_path):
+        job_id = create_job(request_data)
+        update_job_status(
+            job_id,
+            "completed",
+            completed_at=datetime.now(),
+            poster_path=cached_path,
+        )
+        return PosterResponse.model_construct(
+            job_id=job_id,
+            status="completed",
+            message="Poster served from cache",
+            status_url=f"/api/jobs/{job_id}",
+        )
+
+    # An identical request is already rendering; share its job
+    inflight_job_id = _inflight.get(cache_key)
+    if inflight_job_id:
+        return PosterResponse.model_construct(
+            job_id=inflight_job_id,
+            status="pending",
+            message="Identical poster generation already in progress",
+            status_url=f"/api/jobs/{inflight_job_id}",
+        )
+
+    # Create job already marked processing: one DB write instead of a
+    # pending insert plus an immediate status update from the task.
+    job_id = create_job(request_data, status="processing")
+    _inflight[cache_key] = job_id
     
     # Start background task
-    background_tasks.add_task(generate_poster_task, job_id, request)
+    background_tasks.add_task(generate_poster_task, job_id, request, cache_key)
     
-    return PosterResponse(
+    return PosterResponse.model_construct(
         job_id=job_id,
-        status="pending",
+        status="processing",
         message="Poster generation started",
         status_url=f"/api/jobs/{job_id}",
     )
@@ -309,7 +593,7 @@ async def create_poster_endpoint(
     status_code=status.HTTP_202_ACCEPTED,
     tags=["Posters"],
 )
-async def create_all_themes_poster_endpoint(
+def create_all_themes_poster_endpoint(
     request: AllThemesPosterRequest,
     background_tasks: BackgroundTasks,
 ):
@@ -319,42 +603,61 @@ async def create_all_themes_poster_endpoint(
     Generates a poster for each available theme and returns them as a ZIP file.
     Returns a job ID that can be used to check status and download the ZIP file.
     """
-    # Validate coordinates if provided
-    if (request.lat is None) != (request.lon is None):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Both latitude and longitude must be provided together",
+    # Dump the model once (skipping None-valued fields) and reuse it for
+    # both the artifact key and the stored job row.
+    request_data = request.model_dump(mode="json", exclude_none=True)
+    cache_key = _poster_cache_key(request_data)
+
+    # Re-serve a previously built ZIP for an identical request
+    cached_path = _artifact_cache.get(cache_key)
+    if cached_path and os.path.exists(cached_path):
+        job_id = create_job(request_data)
+        update_job_status(
+            job_id,
+            "completed",
+            completed_at=datetime.now(),
+            poster_path=cached_path,
         )
-    
-    # Create job
-    job_id = create_job(request.model_dump())
+        return PosterResponse.model_construct(
+            job_id=job_id,
+            status="completed",
+            message="Posters served from cache",
+            status_url=f"/api/jobs/{job_id}",
+        )
+
+    # An identical request is already rendering; share its job
+    inflight_job_id = _inflight.get(cache_key)
+    if inflight_job_id:
+        return PosterResponse.model_construct(
+            job_id=inflight_job_id,
+            status="pending",
+            message="Identical poster generation already in progress",
+            status_url=f"/api/jobs/{inflight_job_id}",
+        )
+
+    # Create job already marked processing: one DB write instead of a
+    # pending insert plus an immediate status update from the task.
+    job_id = create_job(request_data, status="processing")
+    _inflight[cache_key] = job_id
     
     # Start background task
-    background_tasks.add_task(generate_all_themes_task, job_id, request)
+    background_tasks.add_task(generate_all_themes_task, job_id, request, cache_key)
     
-    return PosterResponse(
+    return PosterResponse.model_construct(
         job_id=job_id,
-        status="pending",
+        status="processing",
         message="All-themes poster generation started",
         status_url=f"/api/jobs/{job_id}",
     )
 
 
-@app.get("/api/jobs/{job_id}", response_model=JobStatusResponse, tags=["Jobs"])
-async def get_job_status(job_id: str):
-    """Check the status of a poster generation job."""
-    job_obj = get_job_db(job_id)
-    if not job_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job {job_id} not found",
-        )
-    
+def _job_status_response(job_obj) -> JobStatusResponse:
+    """Build the status payload for a job row."""
     download_url = None
     if job_obj.status == "completed" and job_obj.poster_path:
-        download_url = f"/api/jobs/{job_id}/download"
+        download_url = f"/api/jobs/{job_obj.job_id}/download"
     
-    return JobStatusResponse(
+    return JobStatusResponse.model_construct(
         job_id=job_obj.job_id,
         status=job_obj.status,
         created_at=job_obj.created_at,
@@ -365,10 +668,69 @@ async def get_job_status(job_id: str):
     )
 
 
+@app.get("/api/jobs/{job_id}", response_model=JobStatusResponse, tags=["Jobs"])
+async def get_job_status(job_id: str):
+    """Check the status of a poster generation job."""
+    job_obj = _get_job_cached(job_id)
+    if not job_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+    
+    # Serialize in one pydantic-core pass and hand FastAPI finished bytes
+    # instead of a model it would dump to dict and re-encode
+    return Response(
+        content=_job_status_response(job_obj).model_dump_json(exclude_none=True),
+        media_type="application/json",
+    )
+
+
+@app.get("/api/jobs/{job_id}/events", tags=["Jobs"])
+async def job_status_events(job_id: str):
+    """
+    Stream job status changes as Server-Sent Events.
+    
+    Emits the current status immediately, then one event per status
+    change until the job reaches a terminal state. A push alternative to
+    polling the status endpoint.
+    """
+    job_obj = _get_job_cached(job_id)
+    if not job_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+    
+    async def event_stream():
+        evt = _job_events.setdefault(job_id, asyncio.Event())
+        _job_watchers[job_id] = _job_watchers.get(job_id, 0) + 1
+        try:
+            while True:
+                # Clear before reading so an update landing between the
+                # read and the wait leaves the event set instead of being
+                # missed.
+                evt.clear()
+                job = _get_job_cached(job_id)
+                yield f"data: {_job_status_response(job).model_dump_json()}\n\n"
+                if job.status in _TERMINAL_STATUSES:
+                    break
+                await evt.wait()
+        finally:
+            remaining = _job_watchers.get(job_id, 1) - 1
+            if remaining <= 0:
+                _job_watchers.pop(job_id, None)
+                _job_events.pop(job_id, None)
+            else:
+                _job_watchers[job_id] = remaining
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.get("/api/jobs/{job_id}/download", tags=["Jobs"])
 async def download_poster(job_id: str):
     """Download the generated poster file."""
-    job_obj = get_job_db(job_id)
+    job_obj = _get_job_cached(job_id)
     if not job_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -382,60 +744,70 @@ async def download_poster(job_id: str):
         )
     
     poster_path = job_obj.poster_path
-    if not poster_path or not os.path.exists(poster_path):
+    if not poster_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Poster file not found",
+        )
+
+    # Trust the stat captured at completion time; it saves a stat syscall
+    # per download and lets the response emit Content-Length/Last-Modified/
+    # ETag without touching the filesystem. Only jobs predating the stored
+    # metadata pay for an existence check here.
+    stat_result = None
+    if job_obj.poster_size is not None and job_obj.poster_mtime is not None:
+        stat_result = os.stat_result(
+            (0o100644, 0, 0, 1, 0, 0, int(job_obj.poster_size), 0, job_obj.poster_mtime, 0)
+        )
+    elif not os.path.exists(poster_path):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Poster file not found",
         )
     
     # Determine media type based on file extension
-    ext = Path(poster_path).suffix.lower()
-    media_type_map = {
-        ".png": "image/png",
-        ".svg": "image/svg+xml",
-        ".pdf": "application/pdf",
-        ".zip": "application/zip",
-    }
-    media_type = media_type_map.get(ext, "application/octet-stream")
+    dot = poster_path.rfind(".")
+    ext = poster_path[dot:].lower() if dot >= 0 else ""
+    media_type = _MEDIA_TYPES.get(ext, "application/octet-stream")
     
     filename = os.path.basename(poster_path)
-    return FileResponse(
+    return SendfileResponse(
         poster_path,
         media_type=media_type,
         filename=filename,
+        stat_result=stat_result,
     )
 
 
 @app.get("/api/themes", response_model=ThemesListResponse, tags=["Themes"])
-async def list_themes():
+def list_themes():
     """List all available themes."""
-    themes = await asyncio.to_thread(get_available_themes)
-    return ThemesListResponse(
+    themes = _cached_themes()
+    return ThemesListResponse.model_construct(
         themes=themes,
         count=len(themes),
     )
 
 
 @app.get("/api/themes/{theme_name}", response_model=ThemeResponse, tags=["Themes"])
-async def get_theme_details(theme_name: str):
+def get_theme_details(theme_name: str):
     """Get details for a specific theme."""
-    available_themes = await asyncio.to_thread(get_available_themes)
-    if theme_name not in available_themes:
+    themes = _all_themes_cached()
+    theme_data = themes.get(theme_name)
+    if theme_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Theme '{theme_name}' not found",
         )
     
-    theme_data = await asyncio.to_thread(load_theme, theme_name)
-    
-    theme_info = ThemeInfo(
+    theme_info = ThemeInfo.model_construct(
         name=theme_name,
         display_name=theme_data.get("name", theme_name),
         description=theme_data.get("description"),
         colors=theme_data,
     )
     
-    return ThemeResponse(theme=theme_info)
+    return ThemeResponse.model_construct(theme=theme_info)
 
 
 @app.post("/api/geocode", response_model=CoordinatesResponse, tags=["Utilities"])
@@ -446,10 +818,8 @@ async def geocode_location(request: GeocodeRequest):
     Useful for getting coordinates before creating a poster.
     """
     try:
-        coords = await asyncio.to_thread(
-            get_coordinates, request.city, request.country
-        )
-        return CoordinatesResponse(
+        coords = await get_coordinates_async(request.city, request.country)
+        return CoordinatesResponse.model_construct(
             latitude=coords[0],
             longitude=coords[1],
             city=request.city,
@@ -461,7 +831,7 @@ async def geocode_location(request: GeocodeRequest):
             detail=str(e),
         )
     except Exception as e:
-        logger.error(f"Geocoding error: {str(e)}", exc_info=True)
+        logger.error("Geocoding error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Geocoding failed: {str(e)}",
@@ -472,10 +842,10 @@ async def geocode_location(request: GeocodeRequest):
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Handle unexpected exceptions."""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
+        content=ErrorResponse.model_construct(
             error="InternalServerError",
             message="An unexpected error occurred",
             details={"error": str(exc)},
@@ -483,19 +853,42 @@ async def global_exception_handler(request, exc):
     )
 
 
-# Mount static files for serving posters (optional)
-if os.path.exists(POSTERS_DIR):
-    app.mount("/posters", StaticFiles(directory=POSTERS_DIR), name="posters")
+class PosterStaticFiles(StaticFiles):
+    """Static poster serving with large chunks and immutable caching.
+
+    Poster filenames embed a timestamp, so the content behind a URL never
+    changes: advertise a week-long immutable Cache-Control so repeat
+    downloads become 304s or local cache hits. Responses use 1 MiB chunks
+    (kernel sendfile applies automatically where the server supports the
+    pathsend extension).
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.chunk_size = SendfileResponse.chunk_size
+        response.headers["Cache-Control"] = "public, max-age=604800, immutable"
+        return response
+
+
+# Mount static files for serving posters; create the directory up front so
+# the mount decision is not dependent on whether a poster was ever rendered.
+os.makedirs(POSTERS_DIR, exist_ok=True)
+app.mount("/posters", PosterStaticFiles(directory=POSTERS_DIR), name="posters")
 
 
 if __name__ == "__main__":
     import uvicorn
     
     logger.info("Starting Map Poster API server...")
+    # uvloop (libuv) and httptools (C parser) replace the pure-Python event
+    # loop and h11 parser; both ship with uvicorn[standard]. Turn reload off
+    # in production — it respawns the worker (and loop) on every file change.
     uvicorn.run(
         "api:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
         log_level="info",
+        loop="uvloop",
+        http="httptools",
     )
@@ -5,6 +5,7 @@ import matplotlib.pyplot as plt
 from matplotlib.font_manager import FontProperties
 import matplotlib.colors as mcolors
 import numpy as np
+import httpx
 from geopy.geocoders import Nominatim
 from tqdm import tqdm
 import time
@@ -289,6 +290,83 @@ def get_coordinates(city, country):
     else:
         raise ValueError(f"Could not find coordinates for {city}, {country}")
     
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+# Shared async HTTP client for geocoding; opened/closed by the API app
+# lifecycle so requests reuse one connection pool.
+_geocoder_client: httpx.AsyncClient | None = None
+
+# Geocoding results are stable, so keep them in memory for the process
+# lifetime in addition to the on-disk pickle cache.
+_coords_memory_cache: dict[tuple[str, str], tuple[float, float]] = {}
+
+
+def open_geocoder_client() -> httpx.AsyncClient:
+    """Create (or return) the shared async geocoder client."""
+    global _geocoder_client
+    if _geocoder_client is None:
+        _geocoder_client = httpx.AsyncClient(
+            timeout=10,
+            headers={"User-Agent": "city_map_poster"},
+        )
+    return _geocoder_client
+
+
+async def close_geocoder_client() -> None:
+    """Close the shared async geocoder client, if open."""
+    global _geocoder_client
+    if _geocoder_client is not None:
+        await _geocoder_client.aclose()
+        _geocoder_client = None
+
+
+async def get_coordinates_async(city, country):
+    """
+    Fetch coordinates for a city and country via the Nominatim HTTP API.
+
+    Async variant of get_coordinates: awaits the network round-trip
+    directly instead of occupying a thread-pool worker. Shares the
+    on-disk cache with the sync version and adds an in-memory cache.
+    """
+    memory_key = (city.lower(), country.lower())
+    cached = _coords_memory_cache.get(memory_key)
+    if cached:
+        return cached
+
+    coords_key = f"coords_{city.lower()}_{country.lower()}"
+    cached = cache_get(coords_key)
+    if cached:
+        print(f"✓ Using cached coordinates for {city}, {country}")
+        _coords_memory_cache[memory_key] = cached
+        return cached
+
+    print("Looking up coordinates...")
+    client = open_geocoder_client()
+    try:
+        response = await client.get(
+            NOMINATIM_URL,
+            params={"q": f"{city}, {country}", "format": "json", "limit": 1},
+        )
+        response.raise_for_status()
+        results = response.json()
+    except Exception as e:
+        raise ValueError(f"Geocoding failed for {city}, {country}: {e}")
+
+    if not results:
+        raise ValueError(f"Could not find coordinates for {city}, {country}")
+
+    location = results[0]
+    coords = (float(location["lat"]), float(location["lon"]))
+    print(f"✓ Found: {location.get('display_name', f'{city}, {country}')}")
+    print(f"✓ Coordinates: {coords[0]}, {coords[1]}")
+    _coords_memory_cache[memory_key] = coords
+    try:
+        cache_set(coords_key, coords)
+    except CacheError as e:
+        print(e)
+    return coords
+
+
 def get_crop_limits(G: MultiDiGraph, fig: Figure) -> tuple[tuple[float, float], tuple[float, float]]:
     """
     Determine cropping limits to maintain aspect ratio of the figure.
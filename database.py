@@ -2,14 +2,14 @@
 SQLite database module for job tracking.
 """
 import os
-import json
+import orjson
 from datetime import datetime
+from functools import cached_property
 from typing import Optional, List
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 
-from sqlalchemy import create_engine, Column, String, DateTime, Text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import bindparam, create_engine, delete, event, insert, select, text, update, BigInteger, Column, Computed, Float, Index, Integer, String, Text, TypeDecorator
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 # Database configuration
 DB_DIR = os.environ.get("DB_DIR", "data")
@@ -21,22 +21,92 @@ engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},  # Needed for SQLite
     echo=False,
+    # Large enough that the hot job statements never get evicted from the
+    # compiled-statement LRU
+    query_cache_size=1200,
+    insertmanyvalues_page_size=1000,
 )
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _):
+    """Apply performance PRAGMAs on every new SQLite connection.
+
+    WAL lets readers proceed while a write is in flight and turns each
+    commit into an append instead of a journal rewrite; synchronous=NORMAL
+    drops the per-commit fsync that FULL forces (safe under WAL). The rest
+    keep temp structures and hot pages in memory.
+    """
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.execute("PRAGMA cache_size=-65536")
+    cur.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+
+
+class Base(DeclarativeBase):
+    """Declarative base on the SQLAlchemy 2.0 API."""
+
+
+class EpochMs(TypeDecorator):
+    """DateTime stored as integer unix-epoch milliseconds.
+
+    Integers compare and index as fixed-width values instead of 19-byte
+    ISO strings, shrinking the timestamp btrees and the row payload.
+    Application code keeps seeing datetime objects on both sides.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(value.timestamp() * 1000)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Row written before the epoch-ms migration ran
+            return datetime.fromisoformat(value)
+        return datetime.fromtimestamp(value / 1000)
 
 
 class Job(Base):
     """Job model for poster generation tracking."""
     __tablename__ = "jobs"
+    # Composite index matching get_all_jobs_db's filter+order: the planner
+    # walks the btree already sorted and stops at LIMIT instead of sorting
+    __table_args__ = (
+        Index("ix_jobs_status_created", "status", "created_at"),
+    )
     
     job_id = Column(String, primary_key=True, index=True)
     status = Column(String, nullable=False, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.now)
-    completed_at = Column(DateTime, nullable=True)
+    created_at = Column(EpochMs, nullable=False, default=datetime.now, index=True)
+    completed_at = Column(EpochMs, nullable=True)
     error = Column(Text, nullable=True)
     poster_path = Column(String, nullable=True)
+    poster_size = Column(Integer, nullable=True)
+    poster_mtime = Column(Float, nullable=True)
     request_data = Column(Text, nullable=False)
+    # Generated columns over the request payload: filters and reports on
+    # these fields run as json_extract inside SQLite (indexed for city and
+    # theme) instead of decoding JSON per row in Python. VIRTUAL rather
+    # than STORED so they can be added to existing databases via ALTER.
+    city = Column(String, Computed("json_extract(request_data, '$.city')", persisted=False), index=True)
+    country = Column(String, Computed("json_extract(request_data, '$.country')", persisted=False))
+    theme = Column(String, Computed("json_extract(request_data, '$.theme')", persisted=False), index=True)
+    format = Column(String, Computed("json_extract(request_data, '$.format')", persisted=False))
+    
+    @cached_property
+    def request_dict(self) -> dict:
+        """Parsed request_data, decoded once per instance."""
+        return orjson.loads(self.request_data) if self.request_data else {}
     
     def to_dict(self):
         """Convert job to dictionary."""
@@ -47,14 +117,79 @@ class Job(Base):
             "completed_at": self.completed_at,
             "error": self.error,
             "poster_path": self.poster_path,
-            "request_data": json.loads(self.request_data) if self.request_data else {},
+            "poster_size": self.poster_size,
+            "poster_mtime": self.poster_mtime,
+            "request_data": self.request_dict,
         }
 
 
+# Hot list statements built once at import: execution only binds
+# parameters instead of constructing and compiling a Query per call.
+_LIST_RECENT = (
+    select(Job)
+    .order_by(Job.created_at.desc(), Job.job_id.desc())
+    .limit(bindparam("lim"))
+)
+_LIST_BY_STATUS = (
+    select(Job)
+    .where(Job.status == bindparam("s"))
+    .order_by(Job.created_at.desc(), Job.job_id.desc())
+    .limit(bindparam("lim"))
+)
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
 
+def _ensure_columns():
+    """Add columns introduced after the table was first created.
+
+    create_all only creates missing tables, so databases from older runs
+    need the new poster metadata columns added in place.
+    """
+    with engine.connect() as conn:
+        # table_xinfo: unlike table_info it also lists generated columns
+        existing = {row[1] for row in conn.exec_driver_sql("PRAGMA table_xinfo(jobs)")}
+        for name, ddl in (("poster_size", "INTEGER"), ("poster_mtime", "FLOAT")):
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE jobs ADD COLUMN {name} {ddl}")
+        for name in ("city", "country", "theme", "format"):
+            if name not in existing:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE jobs ADD COLUMN {name} TEXT GENERATED ALWAYS"
+                    f" AS (json_extract(request_data, '$.{name}')) VIRTUAL"
+                )
+        # Rewrite ISO-text timestamps from before the epoch-ms change in
+        # place: SQLite sorts TEXT after INTEGER, so leaving them mixed
+        # would break created_at ordering. Legacy naive stamps are read
+        # as UTC by strftime, which only shifts rows predating this
+        # migration by at most the server's UTC offset.
+        for col in ("created_at", "completed_at"):
+            conn.exec_driver_sql(
+                f"UPDATE jobs SET {col} ="
+                f" CAST(strftime('%s', {col}) AS INTEGER) * 1000"
+                f" WHERE typeof({col}) = 'text'"
+            )
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_city ON jobs (city)")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_theme ON jobs (theme)")
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_jobs_created_at ON jobs (created_at)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_jobs_status_created"
+            " ON jobs (status, created_at)"
+        )
+        conn.commit()
+
+
+_ensure_columns()
+
+# Refresh planner statistics so the composite/status indexes actually get
+# picked; without sqlite_stat1 the planner can fall back to table scans.
+with engine.begin() as _conn:
+    _conn.exec_driver_sql("ANALYZE")
+
+
 @contextmanager
 def get_db():
     """Get database session context manager."""
@@ -65,49 +200,170 @@ def get_db():
         db.close()
 
 
-def create_job_db(job_id: str, request_data: dict) -> Job:
+@contextmanager
+def transaction():
+    """Session whose single commit covers every helper call made inside.
+
+    Pass the yielded session as ``db`` to the helpers below to batch
+    several operations into one transaction (one fsync under WAL) instead
+    of a commit per call.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _session_scope(db):
+    """Own a new session, or join the caller's without closing it."""
+    return get_db() if db is None else nullcontext(db)
+
+
+def create_job_db(job_id: str, request_data: dict, status: str = "pending", db=None) -> Job:
     """Create a new job in the database."""
-    with get_db() as db:
-        job = Job(
-            job_id=job_id,
-            status="pending",
-            created_at=datetime.now(),
-            request_data=json.dumps(request_data),
+    with _session_scope(db) as session:
+        # INSERT ... RETURNING: one round trip instead of add + commit +
+        # a refresh SELECT to repopulate defaults
+        stmt = (
+            insert(Job)
+            .values(
+                job_id=job_id,
+                status=status,
+                created_at=datetime.now(),
+                request_data=orjson.dumps(request_data).decode(),
+            )
+            .returning(Job)
         )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
+        job = session.execute(stmt).scalar_one()
+        if db is None:
+            # Detach with attributes loaded so expire_on_commit doesn't
+            # leave the returned row unreadable outside the session
+            session.expunge(job)
+            session.commit()
         return job
 
 
-def get_job_db(job_id: str) -> Optional[Job]:
+def create_jobs_bulk(items: List[tuple], db=None) -> None:
+    """Insert many jobs in one transaction.
+
+    For seeding/backfill scripts: one executemany-style INSERT and a
+    single commit (one fsync) instead of a session and commit per row.
+    ``items`` is a list of (job_id, request_data) tuples.
+    """
+    if not items:
+        return
+    now = datetime.now()
+    with _session_scope(db) as session:
+        session.execute(
+            insert(Job),
+            [
+                {
+                    "job_id": job_id,
+                    "status": "pending",
+                    "created_at": now,
+                    "request_data": orjson.dumps(request_data).decode(),
+                }
+                for job_id, request_data in items
+            ],
+        )
+        if db is None:
+            session.commit()
+
+
+def get_job_db(job_id: str, db=None) -> Optional[Job]:
     """Get a job by ID."""
-    with get_db() as db:
-        return db.query(Job).filter(Job.job_id == job_id).first()
+    with _session_scope(db) as session:
+        # PK lookup via Session.get: identity-map aware and uses a cached
+        # compiled statement instead of building a Query each call
+        return session.get(Job, job_id)
 
 
-def update_job_status_db(job_id: str, status: str, **kwargs) -> Optional[Job]:
-    """Update job status and other fields."""
-    with get_db() as db:
-        job = db.query(Job).filter(Job.job_id == job_id).first()
-        if job:
-            job.status = status
-            for key, value in kwargs.items():
-                if hasattr(job, key):
-                    setattr(job, key, value)
-            db.commit()
-            db.refresh(job)
-            return job
-        return None
+def _update_values(status: str, kwargs: dict) -> dict:
+    """Build the UPDATE value map, dropping keys that aren't columns."""
+    values = {"status": status}
+    values.update(
+        {k: v for k, v in kwargs.items() if k in Job.__table__.columns}
+    )
+    return values
 
 
-def get_all_jobs_db(limit: int = 100, status: Optional[str] = None) -> List[Job]:
-    """Get all jobs, optionally filtered by status."""
+def update_job_status_db(job_id: str, status: str, db=None, **kwargs) -> int:
+    """Update job status and other fields; returns the affected row count.
+
+    Issues a single UPDATE instead of the old select-modify-flush round
+    trip. Use update_job_and_return when the updated row is needed.
+    """
+    with _session_scope(db) as session:
+        result = session.execute(
+            update(Job)
+            .where(Job.job_id == job_id)
+            .values(**_update_values(status, kwargs))
+        )
+        if db is None:
+            session.commit()
+        return result.rowcount
+
+
+def update_job_and_return(job_id: str, status: str, db=None, **kwargs) -> Optional[Job]:
+    """Update job status and return the refreshed row, or None if absent."""
+    with _session_scope(db) as session:
+        result = session.execute(
+            update(Job)
+            .where(Job.job_id == job_id)
+            .values(**_update_values(status, kwargs))
+        )
+        if db is None:
+            session.commit()
+        if result.rowcount == 0:
+            return None
+        return session.get(Job, job_id)
+
+
+def get_all_jobs_db(
+    limit: int = 100,
+    status: Optional[str] = None,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+) -> List[Job]:
+    """Get all jobs, optionally filtered by status.
+
+    ``(before, before_id)`` is a keyset cursor: pass the created_at and
+    job_id of the last row of the previous page to fetch the next one.
+    Each page is then a bounded index range scan instead of an
+    increasingly deep offset walk. job_id breaks created_at ties, which
+    are common (bulk inserts share one timestamp and storage is
+    millisecond-granular), so no row is skipped at page boundaries.
+    """
     with get_db() as db:
+        if before is None:
+            # First page: precompiled statements
+            if status:
+                rows = db.execute(_LIST_BY_STATUS, {"s": status, "lim": limit})
+            else:
+                rows = db.execute(_LIST_RECENT, {"lim": limit})
+            return list(rows.scalars())
         query = db.query(Job)
         if status:
             query = query.filter(Job.status == status)
-        return query.order_by(Job.created_at.desc()).limit(limit).all()
+        if before_id is not None:
+            # Compound comparison matching the (created_at, job_id) order;
+            # spelled out per column so the EpochMs bind processing applies
+            query = query.filter(
+                (Job.created_at < before)
+                | ((Job.created_at == before) & (Job.job_id < before_id))
+            )
+        else:
+            query = query.filter(Job.created_at < before)
+        return (
+            query.order_by(Job.created_at.desc(), Job.job_id.desc())
+            .limit(limit)
+            .all()
+        )
 
 
 def delete_old_jobs_db(days: int = 7) -> int:
@@ -116,6 +372,15 @@ def delete_old_jobs_db(days: int = 7) -> int:
     
     cutoff_date = datetime.now() - timedelta(days=days)
     with get_db() as db:
-        deleted = db.query(Job).filter(Job.created_at < cutoff_date).delete()
+        # Core delete: a range scan on the created_at index with no ORM
+        # identity-map bookkeeping for the deleted rows
+        result = db.execute(
+            delete(Job).where(Job.created_at < cutoff_date),
+            execution_options={"synchronize_session": False},
+        )
         db.commit()
-        return deleted
+        if result.rowcount:
+            # Large purges shift the value distribution; refresh stats
+            db.execute(text("ANALYZE"))
+            db.commit()
+        return result.rowcount
@@ -1,38 +1,49 @@
 """
 Pydantic models for the Map Poster API.
 """
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, Literal
 from datetime import datetime
 
+# Job lifecycle states, shared by every model that carries a status.
+# pydantic-core matches a Literal with a hash lookup instead of accepting
+# any string.
+JobStatus = Literal["pending", "processing", "completed", "failed"]
+
 
 class PosterRequest(BaseModel):
     """Request model for creating a map poster."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     city: str = Field(..., min_length=1, max_length=100, description="City name for the poster")
     country: str = Field(..., min_length=1, max_length=100, description="Country name for the poster")
     lat: Optional[float] = Field(None, ge=-90, le=90, description="Latitude (optional, skips geocoding)")
     lon: Optional[float] = Field(None, ge=-180, le=180, description="Longitude (optional, skips geocoding)")
-    theme: str = Field(default="feature_based", description="Theme name")
+    # Theme names stay a constrained str rather than a Literal: the theme
+    # set is a directory that can change without restarting the process,
+    # and existence is validated against the live registry per request.
+    theme: str = Field(default="feature_based", pattern=r"^[A-Za-z0-9_-]+$", description="Theme name")
     distance: int = Field(default=29000, ge=1000, le=50000, description="Map radius in meters")
     format: Literal["png", "svg", "pdf"] = Field(default="png", description="Output format")
     country_label: Optional[str] = Field(None, max_length=100, description="Override country text on poster")
     
-    @field_validator('lat', 'lon')
-    @classmethod
-    def validate_coordinates(cls, v, info):
+    @model_validator(mode="after")
+    def validate_coordinates(self):
         """Ensure both lat and lon are provided together."""
-        # This will be validated in the API endpoint logic
-        return v
+        if (self.lat is None) != (self.lon is None):
+            raise ValueError("Both latitude and longitude must be provided together")
+        return self
 
 
 class GeocodeRequest(BaseModel):
     """Request model for geocoding a location."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     city: str = Field(..., min_length=1, max_length=100, description="City name")
     country: str = Field(..., min_length=1, max_length=100, description="Country name")
 
 
 class AllThemesPosterRequest(BaseModel):
     """Request model for creating map posters with all available themes."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     city: str = Field(..., min_length=1, max_length=100, description="City name for the poster")
     country: str = Field(..., min_length=1, max_length=100, description="Country name for the poster")
     lat: Optional[float] = Field(None, ge=-90, le=90, description="Latitude (optional, skips geocoding)")
@@ -41,16 +52,17 @@ class AllThemesPosterRequest(BaseModel):
     format: Literal["png", "svg", "pdf"] = Field(default="png", description="Output format")
     country_label: Optional[str] = Field(None, max_length=100, description="Override country text on poster")
     
-    @field_validator('lat', 'lon')
-    @classmethod
-    def validate_coordinates(cls, v, info):
+    @model_validator(mode="after")
+    def validate_coordinates(self):
         """Ensure both lat and lon are provided together."""
-        # This will be validated in the API endpoint logic
-        return v
+        if (self.lat is None) != (self.lon is None):
+            raise ValueError("Both latitude and longitude must be provided together")
+        return self
 
 
 class CoordinatesResponse(BaseModel):
     """Response model for coordinates."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     latitude: float = Field(..., description="Latitude coordinate")
     longitude: float = Field(..., description="Longitude coordinate")
     city: str = Field(..., description="City name")
@@ -60,6 +72,7 @@ class CoordinatesResponse(BaseModel):
 
 class ThemeInfo(BaseModel):
     """Information about a single theme."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     name: str = Field(..., description="Theme identifier")
     display_name: str = Field(..., description="Human-readable theme name")
     description: Optional[str] = Field(None, description="Theme description")
@@ -68,19 +81,22 @@ class ThemeInfo(BaseModel):
 
 class ThemesListResponse(BaseModel):
     """Response model for listing themes."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     themes: list[str] = Field(..., description="List of available theme names")
     count: int = Field(..., description="Number of themes available")
 
 
 class ThemeResponse(BaseModel):
     """Response model for a single theme."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     theme: ThemeInfo = Field(..., description="Theme information")
 
 
 class JobStatusResponse(BaseModel):
     """Response model for job status."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     job_id: str = Field(..., description="Unique job identifier")
-    status: Literal["pending", "processing", "completed", "failed"] = Field(..., description="Job status")
+    status: JobStatus = Field(..., description="Job status")
     created_at: datetime = Field(..., description="Job creation timestamp")
     completed_at: Optional[datetime] = Field(None, description="Job completion timestamp")
     error: Optional[str] = Field(None, description="Error message if failed")
@@ -90,14 +106,21 @@ class JobStatusResponse(BaseModel):
 
 class PosterResponse(BaseModel):
     """Response model for poster creation."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     job_id: str = Field(..., description="Job ID for tracking")
-    status: str = Field(..., description="Initial job status")
+    status: JobStatus = Field(..., description="Initial job status")
     message: str = Field(..., description="Status message")
     status_url: str = Field(..., description="URL to check job status")
 
 
+# Build the hot status model's core schema at import time so the first
+# request doesn't pay for schema construction.
+JobStatusResponse.model_rebuild()
+
+
 class ErrorResponse(BaseModel):
     """Response model for errors."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Error message")
     details: Optional[dict] = Field(None, description="Additional error details")
@@ -105,6 +128,7 @@ class ErrorResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Response model for health check."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra="ignore", populate_by_name=True)
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="API version")
     themes_available: int = Field(..., description="Number of themes available")